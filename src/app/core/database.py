@@ -1,31 +1,102 @@
 import os
 from pathlib import Path
-from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from typing import Optional, Sequence
+from fastapi import Request
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, create_async_engine
 from sqlalchemy.orm import DeclarativeBase, sessionmaker
 
 DATABASE_URL = os.getenv("DATABASE_URL", "sqlite+aiosqlite:///./incidents.db")
+DATABASE_ECHO = os.getenv("DATABASE_ECHO", "false").lower() in ("1", "true", "yes")
 
-# Ensure database directory exists
-db_path = DATABASE_URL.split("///")[-1]
-db_dir = os.path.dirname(db_path)
-if db_dir:
-    Path(db_dir).mkdir(parents=True, exist_ok=True)
-    # Touch the database file to ensure it exists
-    Path(db_path).touch(exist_ok=True)
-
-engine = create_async_engine(DATABASE_URL, echo=True)
-AsyncSessionLocal = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+# Bump whenever the models change so existing databases get their DDL applied
+SCHEMA_VERSION = 3
 
 class Base(DeclarativeBase):
     pass
 
-async def get_db() -> AsyncSession:
-    async with AsyncSessionLocal() as session:
+class Database:
+    """
+    The engine and session factory for one database. Both are built on first
+    use, so creating a Database is cheap and does not touch the filesystem.
+    """
+
+    def __init__(self, url: Optional[str] = None, echo: Optional[bool] = None):
+        self.url = url if url else DATABASE_URL
+        self.echo = DATABASE_ECHO if echo is None else echo
+        self._engine: Optional[AsyncEngine] = None
+        self._sessionmaker: Optional[sessionmaker] = None
+
+    @property
+    def engine(self) -> AsyncEngine:
+        if self._engine is None:
+            db_path = self.url.split("///")[-1]
+            if db_path != ":memory:":
+                # Ensure database directory exists
+                db_dir = os.path.dirname(db_path)
+                if db_dir:
+                    Path(db_dir).mkdir(parents=True, exist_ok=True)
+            self._engine = create_async_engine(self.url, echo=self.echo)
+        return self._engine
+
+    @property
+    def sessionmaker(self) -> sessionmaker:
+        if self._sessionmaker is None:
+            self._sessionmaker = sessionmaker(self.engine, class_=AsyncSession, expire_on_commit=False)
+        return self._sessionmaker
+
+    async def dispose(self) -> None:
+        """Close all pooled connections. A new engine is built on next use."""
+        if self._engine is not None:
+            await self._engine.dispose()
+        self._engine = None
+        self._sessionmaker = None
+
+    async def init(self) -> bool:
+        """
+        Create tables and indexes unless the database is already at
+        SCHEMA_VERSION. Returns whether any DDL was run.
+        """
+        async with self.engine.begin() as conn:
+            version = (await conn.execute(text("PRAGMA user_version"))).scalar()
+            if version == SCHEMA_VERSION:
+                return False
+
+            await conn.run_sync(Base.metadata.create_all)
+            await conn.run_sync(create_indexes)
+            await conn.execute(text(f"PRAGMA user_version = {SCHEMA_VERSION}"))
+            return True
+
+    async def warm_up(self, statements: Sequence = ()) -> None:
+        """
+        Open a connection ahead of the first request and run `statements`
+        on it, so the database file's pages are in the OS page cache.
+        Statements should be bounded and indexed: their cost is paid before
+        the app reports ready.
+        """
+        async with self.engine.connect() as conn:
+            await conn.execute(text("SELECT 1"))
+            for statement in statements:
+                await conn.execute(statement)
+
+    async def check(self) -> bool:
+        """Whether the database can currently be queried."""
+        try:
+            async with self.engine.connect() as conn:
+                await conn.execute(text("SELECT 1"))
+            return True
+        except Exception:
+            return False
+
+async def get_db(request: Request) -> AsyncSession:
+    async with request.app.state.database.sessionmaker() as session:
         try:
             yield session
         finally:
             await session.close()
 
-async def init_db():
-    async with engine.begin() as conn:
-        await conn.run_sync(Base.metadata.create_all)
\ No newline at end of file
+def create_indexes(conn):
+    """Create indexes added to tables that already existed."""
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(conn, checkfirst=True)
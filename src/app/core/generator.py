@@ -0,0 +1,56 @@
+import random
+from datetime import datetime, timezone
+from typing import Optional
+
+SERVICES = ["api", "database", "web", "auth", "storage", "compute"]
+STATES = ["operational", "degraded", "outage", "maintenance"]
+COMPONENT_TYPES = ["server", "database", "cache", "load-balancer", "api"]
+
+def random_incident(
+    rng: random.Random = random,
+    state: Optional[str] = None,
+    service: Optional[str] = None,
+    now: Optional[datetime] = None
+) -> dict:
+    """
+    Generate the data for a random incident, shaped like `IncidentCreate`.
+    Optionally specify the service and the desired state of the incident.
+    """
+    service = service if service else rng.choice(SERVICES)
+    # Use provided state or random if not provided
+    current_state = state if state else rng.choice(STATES)
+    # Ensure previous state is different from current
+    previous_state = rng.choice([s for s in STATES if s != current_state])
+    now = now if now else datetime.utcnow()
+    # `now` is naive UTC; timestamp() alone would apply the host's timezone
+    timestamp = int(now.replace(tzinfo=timezone.utc).timestamp())
+    
+    # Generate 1-3 random components
+    components = rng.sample(COMPONENT_TYPES, rng.randint(1, 3))
+    
+    # Generate incident title based on service and state
+    titles = [
+        f"{service.title()} Service {current_state.title()} Detected",
+        f"Unexpected {current_state.title()} in {service.title()} System",
+        f"{service.title()} Performance {current_state.title()}",
+        f"Investigating {service.title()} Service Issues"
+    ]
+    
+    descriptions = [
+        f"Our monitoring system detected {current_state} status in the {service} service affecting {', '.join(components)}.",
+        f"We are investigating reports of {current_state} performance in the {service} system.",
+        f"Engineers are responding to {current_state} alerts from {service} service components.",
+        f"Automated systems detected abnormal behavior in {service} service {components[0]}."
+    ]
+    
+    return {
+        "service": service,
+        "previous_state": previous_state,
+        "current_state": current_state,
+        "incident": {
+            "title": rng.choice(titles),
+            "description": rng.choice(descriptions),
+            "components": components,
+            "url": f"https://status.joseserver.com/incidents/{service}-{timestamp}"
+        }
+    }
@@ -0,0 +1,112 @@
+from datetime import datetime
+from typing import Optional
+from sqlalchemy import select, desc, func, and_, literal
+from sqlalchemy.sql import Select
+
+from app.models.incident import Incident
+from app.models.history import IncidentHistory
+
+def latest_per_service_query(base_query: Select = None) -> Select:
+    """
+    Build a query returning the latest incident for each service.
+    """
+    if base_query is None:
+        base_query = select(Incident)
+
+    # First, get the latest incident per service using a CTE
+    latest_per_service = (
+        select(
+            Incident.service,
+            func.max(Incident.created_at).label('max_created_at')
+        )
+        .group_by(Incident.service)
+        .cte('latest_per_service')
+    )
+
+    # Then join with the main table to get the full incident details
+    return (
+        base_query
+        .join(
+            latest_per_service,
+            and_(
+                Incident.service == latest_per_service.c.service,
+                Incident.created_at == latest_per_service.c.max_created_at
+            )
+        )
+        .order_by(desc(Incident.created_at))
+    )
+
+def most_recent_query(count: int, base_query: Select = None) -> Select:
+    """
+    Build a query returning the `count` most recent incidents.
+    """
+    if base_query is None:
+        base_query = select(Incident)
+
+    return (
+        base_query
+        .order_by(desc(Incident.created_at))
+        .limit(count)
+    )
+
+def status_at_query(ts: Optional[datetime] = None) -> Select:
+    """
+    Build a query returning the last history entry at or before `ts` for
+    every service, or the latest entry if `ts` is None.
+
+    Services are enumerated with a recursive loose index scan and each one is
+    resolved with a single seek on the (service, recorded_at) index, so the
+    cost grows with the number of services rather than the length of the
+    history.
+    """
+    services = (
+        select(func.min(IncidentHistory.service).label('service'))
+        .cte('services', recursive=True)
+    )
+    next_service = (
+        select(func.min(IncidentHistory.service))
+        .filter(IncidentHistory.service > services.c.service)
+        .scalar_subquery()
+    )
+    services = services.union_all(
+        select(next_service).filter(services.c.service.is_not(None))
+    )
+
+    last_transition = select(IncidentHistory.id).filter(
+        IncidentHistory.service == services.c.service
+    )
+    if ts is not None:
+        last_transition = last_transition.filter(IncidentHistory.recorded_at <= ts)
+    last_transition = (
+        last_transition
+        .order_by(desc(IncidentHistory.recorded_at), desc(IncidentHistory.id))
+        .limit(1)
+        .correlate(services)
+        .scalar_subquery()
+    )
+
+    return (
+        select(IncidentHistory)
+        .select_from(services)
+        .join(IncidentHistory, IncidentHistory.id == last_transition)
+        .order_by(IncidentHistory.service)
+    )
+
+def open_incident_states_query() -> Select:
+    """
+    Build a query returning the number of open incidents per service and
+    state, plus one row with a NULL service holding the highest history id.
+    Both parts come from a single statement, so the counts include exactly
+    the history entries up to that id.
+    """
+    watermark = select(
+        literal(None).label("service"),
+        literal(None).label("current_state"),
+        func.coalesce(func.max(IncidentHistory.id), 0)
+    )
+    counts = (
+        select(Incident.service, Incident.current_state, func.count())
+        .filter(Incident.current_state != "operational")
+        .group_by(Incident.service, Incident.current_state)
+    )
+    return watermark.union_all(counts)
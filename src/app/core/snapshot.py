@@ -0,0 +1,115 @@
+import asyncio
+import json
+import logging
+import os
+import tempfile
+from datetime import datetime
+from pathlib import Path
+from typing import Optional
+
+from fastapi.encoders import jsonable_encoder
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.queries import latest_per_service_query, most_recent_query
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_PATH = os.getenv("SNAPSHOT_PATH")
+SNAPSHOT_RECENT_COUNT = int(os.getenv("SNAPSHOT_RECENT_COUNT", "50"))
+SNAPSHOT_DEBOUNCE_SECONDS = float(os.getenv("SNAPSHOT_DEBOUNCE_SECONDS", "1.0"))
+
+async def build_snapshot(db: AsyncSession, recent_count: int = SNAPSHOT_RECENT_COUNT) -> dict:
+    """
+    Build the status snapshot: the latest incident per service plus the
+    `recent_count` most recent incidents.
+    """
+    result = await db.execute(latest_per_service_query())
+    latest = [incident.to_dict() for incident in result.scalars().all()]
+
+    result = await db.execute(most_recent_query(recent_count))
+    recent = [incident.to_dict() for incident in result.scalars().all()]
+
+    return {
+        "generated_at": datetime.utcnow(),
+        "recent_limit": recent_count,
+        "latest": latest,
+        "recent": recent
+    }
+
+def write_snapshot(path: Path, snapshot: dict) -> None:
+    """
+    Write the snapshot as compact JSON, replacing `path` atomically so
+    readers never observe a partially written file.
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    payload = json.dumps(jsonable_encoder(snapshot), separators=(",", ":"))
+
+    fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w") as f:
+            f.write(payload)
+            f.flush()
+            os.fsync(f.fileno())
+        # mkstemp creates the file as 0600; the web server needs to read it
+        os.chmod(tmp_path, 0o644)
+        os.replace(tmp_path, path)
+    except BaseException:
+        Path(tmp_path).unlink(missing_ok=True)
+        raise
+
+class SnapshotWriter:
+    """
+    Rebuilds the static status snapshot after writes.
+
+    Calls to `schedule` within the debounce window are coalesced into a single
+    rebuild that runs in the background, so the write path never waits on it.
+    """
+
+    def __init__(
+        self,
+        session_factory,
+        path: str,
+        recent_count: int = SNAPSHOT_RECENT_COUNT,
+        debounce_seconds: float = SNAPSHOT_DEBOUNCE_SECONDS
+    ):
+        self.session_factory = session_factory
+        self.path = Path(path)
+        self.recent_count = recent_count
+        self.debounce_seconds = debounce_seconds
+        self._dirty = False
+        self._task: Optional[asyncio.Task] = None
+
+    async def rebuild(self) -> None:
+        """Rebuild the snapshot from the database immediately."""
+        async with self.session_factory() as session:
+            snapshot = await build_snapshot(session, self.recent_count)
+        await asyncio.to_thread(write_snapshot, self.path, snapshot)
+
+    def schedule(self) -> None:
+        """Request a rebuild after the debounce window."""
+        self._dirty = True
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    async def _run(self) -> None:
+        while self._dirty:
+            await asyncio.sleep(self.debounce_seconds)
+            self._dirty = False
+            try:
+                await self.rebuild()
+            except Exception:
+                logger.exception("Failed to rebuild status snapshot")
+
+    async def close(self) -> None:
+        """Flush any pending rebuild and stop the background task."""
+        if self._task is not None and not self._task.done():
+            # The task may be cancelled mid-rebuild, so always rebuild once more
+            self._dirty = True
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+        if self._dirty:
+            self._dirty = False
+            await self.rebuild()
@@ -0,0 +1,185 @@
+import asyncio
+import logging
+import os
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+from app.core.queries import open_incident_states_query, status_at_query
+from app.models.history import IncidentHistory
+
+logger = logging.getLogger(__name__)
+
+STATE_RECONCILE_INTERVAL = float(os.getenv("STATE_RECONCILE_INTERVAL", "60"))
+
+OPERATIONAL = "operational"
+
+# Used to pick the overall status; unknown states count as degraded
+SEVERITY = {
+    "operational": 0,
+    "maintenance": 1,
+    "degraded": 2,
+    "outage": 3
+}
+
+STATUS_BY_SEVERITY = {level: state for state, level in SEVERITY.items()}
+
+def severity(state: str) -> int:
+    return SEVERITY.get(state, SEVERITY["degraded"])
+
+def is_open(state: str) -> bool:
+    return state != OPERATIONAL
+
+class ServiceState:
+    """
+    A service's open incidents, counted by state. The service is in the
+    worst of those states, or operational when none are open.
+    """
+
+    def __init__(self, service: str, open_states: Optional[Dict[str, int]] = None,
+                 last_transition_at: Optional[datetime] = None):
+        self.service = service
+        self.open_states: Dict[str, int] = dict(open_states or {})
+        self.last_transition_at = last_transition_at
+
+    @property
+    def status(self) -> str:
+        return max(self.open_states, key=severity, default=OPERATIONAL)
+
+    @property
+    def open_incidents(self) -> int:
+        return sum(self.open_states.values())
+
+    def open(self, state: str) -> None:
+        if is_open(state):
+            self.open_states[state] = self.open_states.get(state, 0) + 1
+
+    def close(self, state: str) -> None:
+        if is_open(state) and self.open_states.get(state, 0) > 0:
+            self.open_states[state] -= 1
+            if not self.open_states[state]:
+                del self.open_states[state]
+
+class StateIndex:
+    """
+    In-memory view of every service's current state, kept up to date by the
+    write endpoints after they commit and periodically reconciled with the
+    database to correct any drift.
+    """
+
+    def __init__(self, session_factory, reconcile_interval: float = STATE_RECONCILE_INTERVAL):
+        self.session_factory = session_factory
+        self.reconcile_interval = reconcile_interval
+        self.services: Dict[str, ServiceState] = {}
+        self.reconciled_at: Optional[datetime] = None
+        # Highest history id included in the last load; older entries are already counted
+        self.loaded_through = 0
+        # Entries recorded while a load is running, replayed on top of its result
+        self._recorded_during_load: Optional[List[Tuple[IncidentHistory, bool]]] = None
+        self._task: Optional[asyncio.Task] = None
+
+    async def load(self) -> None:
+        """
+        Rebuild the index from the database. Entries recorded while loading
+        are applied again afterwards unless the load already includes them.
+        """
+        self._recorded_during_load = recorded = []
+        try:
+            async with self.session_factory() as session:
+                # Counted first: the last transitions read next are at least as recent
+                rows = (await session.execute(open_incident_states_query())).all()
+                result = await session.execute(status_at_query())
+                entries = result.scalars().all()
+        finally:
+            self._recorded_during_load = None
+
+        services: Dict[str, ServiceState] = {}
+        loaded_through = 0
+        for service, state, count in rows:
+            if service is None:
+                loaded_through = count
+                continue
+            services.setdefault(service, ServiceState(service)).open_states[state] = count
+        for entry in entries:
+            services.setdefault(entry.service, ServiceState(entry.service)).last_transition_at = entry.recorded_at
+
+        self.services = services
+        self.loaded_through = loaded_through
+        self.reconciled_at = datetime.utcnow()
+        for entry, created in recorded:
+            self._apply(entry, created)
+
+    def record(self, entry: IncidentHistory, created: bool) -> None:
+        """
+        Apply a committed history entry. `created` is True when the entry is
+        the first one of a new incident. Entries the last load already
+        included are ignored, so recording is safe whenever the load ran.
+        """
+        if self._recorded_during_load is not None:
+            self._recorded_during_load.append((entry, created))
+        self._apply(entry, created)
+
+    def _apply(self, entry: IncidentHistory, created: bool) -> None:
+        if entry.id is not None and entry.id <= self.loaded_through:
+            return
+
+        state = self.services.get(entry.service)
+        if state is None:
+            state = self.services[entry.service] = ServiceState(entry.service)
+
+        if state.last_transition_at is None or entry.recorded_at > state.last_transition_at:
+            state.last_transition_at = entry.recorded_at
+
+        if not created:
+            state.close(entry.previous_state)
+        state.open(entry.current_state)
+
+    def summary(self) -> dict:
+        """
+        Overall status and the status of every service. A service's status
+        is the worst state among its open incidents, so unlike /status/at it
+        does not depend on which incident changed last.
+        """
+        now = datetime.utcnow()
+        services = sorted(self.services.values(), key=lambda s: s.service)
+        worst = max((severity(s.status) for s in services), default=SEVERITY[OPERATIONAL])
+
+        return {
+            "status": STATUS_BY_SEVERITY[worst],
+            "open_incidents": sum(s.open_incidents for s in services),
+            "reconciled_at": self.reconciled_at,
+            "services": [
+                {
+                    "service": s.service,
+                    "status": s.status,
+                    "open_incidents": s.open_incidents,
+                    "last_transition_at": s.last_transition_at,
+                    "seconds_since_transition": (
+                        (now - s.last_transition_at).total_seconds()
+                        if s.last_transition_at else None
+                    )
+                }
+                for s in services
+            ]
+        }
+
+    def start(self) -> None:
+        """Start reconciling with the database every `reconcile_interval` seconds."""
+        if self.reconcile_interval > 0:
+            self._task = asyncio.create_task(self._reconcile_loop())
+
+    async def close(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _reconcile_loop(self) -> None:
+        while True:
+            await asyncio.sleep(self.reconcile_interval)
+            try:
+                await self.load()
+            except Exception:
+                logger.exception("Failed to reconcile state index")
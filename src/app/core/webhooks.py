@@ -0,0 +1,314 @@
+import asyncio
+import logging
+import os
+from collections import defaultdict
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+
+import httpx
+from fastapi.encoders import jsonable_encoder
+from sqlalchemy import select, update, delete, func, and_, or_
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.incident import Incident
+from app.models.webhook import WebhookSubscriber, WebhookOutbox
+
+logger = logging.getLogger(__name__)
+
+WEBHOOK_WORKERS = int(os.getenv("WEBHOOK_WORKERS", "4"))
+WEBHOOK_BATCH_SIZE = int(os.getenv("WEBHOOK_BATCH_SIZE", "50"))
+WEBHOOK_POLL_INTERVAL = float(os.getenv("WEBHOOK_POLL_INTERVAL", "1.0"))
+WEBHOOK_MAX_ATTEMPTS = int(os.getenv("WEBHOOK_MAX_ATTEMPTS", "8"))
+WEBHOOK_BACKOFF_BASE = float(os.getenv("WEBHOOK_BACKOFF_BASE", "1.0"))
+WEBHOOK_BACKOFF_MAX = float(os.getenv("WEBHOOK_BACKOFF_MAX", "300.0"))
+WEBHOOK_TIMEOUT = float(os.getenv("WEBHOOK_TIMEOUT", "10.0"))
+WEBHOOK_CLAIM_LEASE = float(os.getenv("WEBHOOK_CLAIM_LEASE", "120.0"))
+
+def incident_payload(incident: Incident) -> dict:
+    """
+    Build the webhook payload for an incident. Only column attributes are
+    read so this is safe to call before the transaction commits.
+    """
+    return jsonable_encoder({
+        "id": incident.id,
+        "service": incident.service,
+        "previous_state": incident.previous_state,
+        "current_state": incident.current_state,
+        "created_at": incident.created_at,
+        "incident": {
+            "title": incident.title,
+            "description": incident.description,
+            "components": incident.components,
+            "url": incident.url
+        }
+    })
+
+async def enqueue_event(db: AsyncSession, event_type: str, payload: dict) -> int:
+    """
+    Add an outbox row for every subscriber of `event_type`.
+
+    Does not commit: the caller commits the outbox rows together with the
+    change they describe. Returns the number of rows added.
+    """
+    result = await db.execute(select(WebhookSubscriber))
+    subscribers = [s for s in result.scalars().all() if s.wants(event_type)]
+
+    for subscriber in subscribers:
+        db.add(WebhookOutbox(
+            subscriber_id=subscriber.id,
+            event_type=event_type,
+            payload=payload
+        ))
+
+    return len(subscribers)
+
+def backoff_delay(attempts: int, base: float = WEBHOOK_BACKOFF_BASE, maximum: float = WEBHOOK_BACKOFF_MAX) -> float:
+    """Exponential backoff delay in seconds after `attempts` failed attempts."""
+    return min(maximum, base * (2 ** (attempts - 1)))
+
+class WebhookBatch:
+    def __init__(self, subscriber_id: int, url: str, rows: List[WebhookOutbox]):
+        self.subscriber_id = subscriber_id
+        self.url = url
+        self.ids = [row.id for row in rows]
+        self.body = {
+            "events": [
+                {
+                    "id": row.id,
+                    "event": row.event_type,
+                    "created_at": row.created_at.isoformat(),
+                    "data": row.payload
+                }
+                for row in rows
+            ]
+        }
+
+class WebhookDispatcher:
+    """
+    Delivers outbox rows to subscribers in the background.
+
+    A single poller claims due rows, groups them into per-subscriber batches
+    and hands them to a pool of workers sharing one pooled HTTP client. A
+    subscriber never has more than its `max_concurrency` batches in flight.
+    Delivered rows are deleted, keeping only the counters. Failed batches are
+    retried with exponential backoff until `max_attempts` is reached.
+
+    Claimed rows hold a lease of `claim_lease` seconds; if their outcome is
+    not recorded by then, they are claimed and delivered again.
+    """
+
+    def __init__(
+        self,
+        session_factory,
+        client: Optional[httpx.AsyncClient] = None,
+        workers: int = WEBHOOK_WORKERS,
+        batch_size: int = WEBHOOK_BATCH_SIZE,
+        poll_interval: float = WEBHOOK_POLL_INTERVAL,
+        max_attempts: int = WEBHOOK_MAX_ATTEMPTS,
+        backoff_base: float = WEBHOOK_BACKOFF_BASE,
+        backoff_max: float = WEBHOOK_BACKOFF_MAX,
+        claim_lease: float = WEBHOOK_CLAIM_LEASE
+    ):
+        self.session_factory = session_factory
+        self.client = client
+        self._owns_client = client is None
+        self.workers = workers
+        self.batch_size = batch_size
+        self.poll_interval = poll_interval
+        self.max_attempts = max_attempts
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.claim_lease = claim_lease
+
+        self.batches_sent = 0
+        self.events_delivered = 0
+        self.events_retried = 0
+        self.events_failed = 0
+
+        self._queue: asyncio.Queue = asyncio.Queue(maxsize=workers * 2)
+        self._in_flight: Dict[int, int] = defaultdict(int)
+        self._wakeup = asyncio.Event()
+        self._tasks: List[asyncio.Task] = []
+
+    async def start(self) -> None:
+        """
+        Start the poller and the workers. Rows abandoned by a previous
+        process are claimed again once their lease expires.
+        """
+        if self.client is None:
+            self.client = httpx.AsyncClient(
+                timeout=WEBHOOK_TIMEOUT,
+                limits=httpx.Limits(
+                    max_connections=self.workers * 2,
+                    max_keepalive_connections=self.workers
+                )
+            )
+
+        self._tasks.append(asyncio.create_task(self._poll_loop()))
+        for _ in range(self.workers):
+            self._tasks.append(asyncio.create_task(self._worker()))
+
+    async def close(self) -> None:
+        """Stop the workers. Undelivered rows stay in the outbox."""
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        if self._owns_client and self.client is not None:
+            await self.client.aclose()
+            self.client = None
+
+    def notify(self) -> None:
+        """Wake the poller after new outbox rows have been committed."""
+        self._wakeup.set()
+
+    async def _poll_loop(self) -> None:
+        while True:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.poll_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            try:
+                await self.poll()
+            except Exception:
+                logger.exception("Failed to poll webhook outbox")
+
+    async def poll(self) -> int:
+        """
+        Claim due outbox rows, including in-flight rows whose lease has
+        expired, and queue them as batches. Returns the number of batches queued.
+
+        Rows are selected per subscriber, at most enough to fill its free
+        concurrency slots, so a backlogged subscriber cannot hold up the others.
+        """
+        now = datetime.utcnow()
+        lease_expires_at = now + timedelta(seconds=self.claim_lease)
+        due = and_(
+            or_(WebhookOutbox.status == "pending", WebhookOutbox.status == "in_flight"),
+            WebhookOutbox.next_attempt_at <= now
+        )
+        batches = []
+        async with self.session_factory() as session:
+            result = await session.execute(select(WebhookSubscriber).order_by(WebhookSubscriber.id))
+            for subscriber in result.scalars().all():
+                free = subscriber.max_concurrency - self._in_flight[subscriber.id]
+                if free <= 0:
+                    continue
+
+                result = await session.execute(
+                    select(WebhookOutbox)
+                    .where(WebhookOutbox.subscriber_id == subscriber.id, due)
+                    .order_by(WebhookOutbox.id)
+                    .limit(free * self.batch_size)
+                )
+                rows = result.scalars().all()
+                if not rows:
+                    continue
+
+                # Another process may have claimed some of the rows since they
+                # were read, so the claim re-checks that they are still due
+                result = await session.execute(
+                    update(WebhookOutbox)
+                    .where(WebhookOutbox.id.in_([row.id for row in rows]), due)
+                    .values(status="in_flight", next_attempt_at=lease_expires_at)
+                    .returning(WebhookOutbox.id)
+                    .execution_options(synchronize_session=False)
+                )
+                claimed = set(result.scalars().all())
+                rows = [row for row in rows if row.id in claimed]
+
+                for start in range(0, len(rows), self.batch_size):
+                    batch_rows = rows[start:start + self.batch_size]
+                    batches.append(WebhookBatch(subscriber.id, subscriber.url, batch_rows))
+                    self._in_flight[subscriber.id] += 1
+
+            await session.commit()
+
+        for batch in batches:
+            await self._queue.put(batch)
+        return len(batches)
+
+    async def _worker(self) -> None:
+        while True:
+            batch = await self._queue.get()
+            try:
+                await self.deliver(batch)
+            except Exception:
+                logger.exception("Failed to record webhook delivery for subscriber %s", batch.subscriber_id)
+            finally:
+                self._in_flight[batch.subscriber_id] -= 1
+                self._queue.task_done()
+                # The subscriber has a free slot now
+                self._wakeup.set()
+
+    async def deliver(self, batch: WebhookBatch) -> bool:
+        """
+        POST a batch and record the outcome: delivered rows are deleted,
+        failed ones are rescheduled or marked failed.
+        """
+        error = None
+        try:
+            response = await self.client.post(batch.url, json=batch.body)
+            response.raise_for_status()
+        except httpx.HTTPError as e:
+            error = str(e) or e.__class__.__name__
+
+        now = datetime.utcnow()
+        async with self.session_factory() as session:
+            if error is None:
+                result = await session.execute(
+                    delete(WebhookOutbox).where(WebhookOutbox.id.in_(batch.ids))
+                )
+                await session.commit()
+                self.events_delivered += result.rowcount
+                self.batches_sent += 1
+                return True
+
+            result = await session.execute(
+                select(WebhookOutbox).where(WebhookOutbox.id.in_(batch.ids))
+            )
+            for row in result.scalars().all():
+                row.attempts += 1
+                if row.attempts >= self.max_attempts:
+                    row.status = "failed"
+                    row.last_error = error[:500]
+                    self.events_failed += 1
+                else:
+                    row.status = "pending"
+                    row.last_error = error[:500]
+                    row.next_attempt_at = now + timedelta(
+                        seconds=backoff_delay(row.attempts, self.backoff_base, self.backoff_max)
+                    )
+                    self.events_retried += 1
+            await session.commit()
+
+        self.batches_sent += 1
+        logger.warning("Webhook delivery to %s failed: %s", batch.url, error)
+        return False
+
+async def outbox_metrics(db: AsyncSession, dispatcher: Optional[WebhookDispatcher] = None) -> dict:
+    """
+    Outbox depth and queue lag, plus the delivery counters of `dispatcher`
+    if one is running in this process.
+    """
+    result = await db.execute(
+        select(WebhookOutbox.status, func.count(), func.min(WebhookOutbox.created_at))
+        .group_by(WebhookOutbox.status)
+    )
+    counts = {status: (count, oldest) for status, count, oldest in result.all()}
+
+    pending, oldest_pending = counts.get("pending", (0, None))
+    in_flight, oldest_in_flight = counts.get("in_flight", (0, None))
+    oldest = min((d for d in (oldest_pending, oldest_in_flight) if d is not None), default=None)
+    lag = (datetime.utcnow() - oldest).total_seconds() if oldest is not None else 0.0
+
+    counters = ("batches_sent", "events_delivered", "events_retried", "events_failed")
+    return {
+        "pending": pending,
+        "in_flight": in_flight,
+        "failed": counts.get("failed", (0, None))[0],
+        "oldest_pending_at": oldest,
+        "queue_lag_seconds": max(lag, 0.0),
+        **{name: getattr(dispatcher, name, 0) for name in counters}
+    }
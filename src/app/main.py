@@ -1,18 +1,27 @@
 from contextlib import asynccontextmanager
-from datetime import datetime
+from datetime import datetime, timezone
 from typing import List, Optional
-import random
-from fastapi import FastAPI, Depends, Query, HTTPException
+from fastapi import APIRouter, FastAPI, Depends, Query, HTTPException, Request
 from fastapi.responses import JSONResponse
 from fastapi.middleware.cors import CORSMiddleware
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, desc, func, and_
+from sqlalchemy import select, delete
 
-from app.core.database import init_db, get_db
+from app.core.database import Database, get_db
+from app.core.generator import random_incident, STATES
+from app.core.queries import latest_per_service_query, most_recent_query, status_at_query
+from app.core.state_index import StateIndex
+from app.core.snapshot import SnapshotWriter, SNAPSHOT_PATH, SNAPSHOT_RECENT_COUNT
+from app.core.webhooks import (
+    WebhookDispatcher, WEBHOOK_WORKERS, enqueue_event, incident_payload, outbox_metrics
+)
 from app.models.incident import Incident
 from app.models.history import IncidentHistory
-from app.schemas.incident import IncidentCreate, IncidentResponse, IncidentDetail
+from app.models.webhook import WebhookSubscriber, WebhookOutbox
+from app.schemas.incident import IncidentCreate, IncidentResponse
 from app.schemas.history import IncidentWithHistory, IncidentHistoryResponse
+from app.schemas.status import StatusAtResponse, StatusSummary
+from app.schemas.webhook import WebhookSubscriberCreate, WebhookSubscriberResponse, WebhookMetrics
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
@@ -20,48 +29,67 @@ async def lifespan(app: FastAPI):
     Initialize application state on startup.
     """
     app.state.boot_time = datetime.utcnow()
-    await init_db()
+    app.state.ready = False
+    database = app.state.database
+    await database.init()
+    session_factory = database.sessionmaker
+
+    app.state.state_index = StateIndex(session_factory)
+    await app.state.state_index.load()
+    app.state.state_index.start()
+
+    app.state.snapshot_writer = None
+    if SNAPSHOT_PATH:
+        app.state.snapshot_writer = SnapshotWriter(session_factory, SNAPSHOT_PATH)
+        await app.state.snapshot_writer.rebuild()
+
+    app.state.webhook_dispatcher = None
+    if WEBHOOK_WORKERS > 0:
+        app.state.webhook_dispatcher = WebhookDispatcher(session_factory)
+        await app.state.webhook_dispatcher.start()
+
+    # Load the index pages the hottest reads need
+    await database.warm_up([
+        most_recent_query(SNAPSHOT_RECENT_COUNT),
+        status_at_query()
+    ])
+    app.state.ready = True
+
     yield
 
-app = FastAPI(
-    title="Status Service",
-    description="Health check service for joseserver.com",
-    version="0.1.0",
-    lifespan=lifespan
-)
+    app.state.ready = False
+    await app.state.state_index.close()
+    if app.state.webhook_dispatcher is not None:
+        await app.state.webhook_dispatcher.close()
+    if app.state.snapshot_writer is not None:
+        await app.state.snapshot_writer.close()
+    await database.dispose()
 
-# Configure CORS
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=["https://status.joseserver.com"],
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"]
-)
+router = APIRouter()
 
-@app.get("/health")
-async def health_check() -> JSONResponse:
+def after_commit(app: FastAPI, entry: IncidentHistory, created: bool = False) -> None:
     """
-    Health check endpoint that returns the service status.
+    Apply a committed history entry to the in-memory state index and kick
+    off background work that follows the write: rebuilding the static status
+    snapshot and delivering webhooks, when enabled.
     """
-    return JSONResponse(
-        content={
-            "status": "healthy",
-            "version": app.version,
-            "timestamp": str(app.state.boot_time)
-        },
-        status_code=200
-    )
+    state_index = getattr(app.state, "state_index", None)
+    if state_index is not None:
+        state_index.record(entry, created)
 
-@app.post("/incidents", response_model=IncidentWithHistory)
-async def create_incident(
-    incident_data: IncidentCreate,
-    db: AsyncSession = Depends(get_db)
-) -> dict:
+    writer = getattr(app.state, "snapshot_writer", None)
+    if writer is not None:
+        writer.schedule()
+
+    dispatcher = getattr(app.state, "webhook_dispatcher", None)
+    if dispatcher is not None:
+        dispatcher.notify()
+
+async def record_incident(db: AsyncSession, incident_data: IncidentCreate) -> Incident:
     """
-    Create a new incident record and record it in history.
+    Create an incident together with its first history entry and webhook
+    outbox rows, all in a single transaction.
     """
-    # Create the incident
     incident = Incident(
         service=incident_data.service,
         previous_state=incident_data.previous_state,
@@ -73,8 +101,7 @@ async def create_incident(
     )
     
     db.add(incident)
-    await db.commit()
-    await db.refresh(incident)
+    await db.flush()  # Assign the incident id
     
     # Create history entry
     history_entry = IncidentHistory(
@@ -89,12 +116,52 @@ async def create_incident(
     )
     
     db.add(history_entry)
+    await enqueue_event(db, "incident.created", incident_payload(incident))
     await db.commit()
     await db.refresh(incident)  # Refresh to get the new history
     
+    return incident
+
+@router.get("/health")
+async def health_check(request: Request) -> JSONResponse:
+    """
+    Health check endpoint that returns the service status.
+    """
+    return JSONResponse(
+        content={
+            "status": "healthy",
+            "version": request.app.version,
+            "timestamp": str(request.app.state.boot_time)
+        },
+        status_code=200
+    )
+
+@router.get("/ready")
+async def readiness_check(request: Request) -> JSONResponse:
+    """
+    Readiness endpoint: 200 once startup has finished and the database
+    answers queries, 503 otherwise.
+    """
+    ready = getattr(request.app.state, "ready", False) and await request.app.state.database.check()
+    return JSONResponse(
+        content={"status": "ready" if ready else "unavailable"},
+        status_code=200 if ready else 503
+    )
+
+@router.post("/incidents", response_model=IncidentWithHistory)
+async def create_incident(
+    request: Request,
+    incident_data: IncidentCreate,
+    db: AsyncSession = Depends(get_db)
+) -> dict:
+    """
+    Create a new incident record and record it in history.
+    """
+    incident = await record_incident(db, incident_data)
+    after_commit(request.app, incident.history[0], created=True)
     return incident.to_dict()
 
-@app.get("/incidents/{incident_id}/history", response_model=List[IncidentHistoryResponse])
+@router.get("/incidents/{incident_id}/history", response_model=List[IncidentHistoryResponse])
 async def get_incident_history(
     incident_id: int,
     db: AsyncSession = Depends(get_db)
@@ -108,7 +175,7 @@ async def get_incident_history(
     
     return [entry.to_dict() for entry in history]
 
-@app.get("/incidents/recent", response_model=List[IncidentWithHistory])
+@router.get("/incidents/recent", response_model=List[IncidentWithHistory])
 async def get_recent_incidents(
     start_date: Optional[datetime] = Query(
         None,
@@ -135,47 +202,71 @@ async def get_recent_incidents(
 
     if count is not None:
         # When count is provided, return that many most recent incidents
-        query = (
-            base_query
-            .order_by(desc(Incident.created_at))
-            .limit(count)
-        )
+        query = most_recent_query(count, base_query)
     else:
         # Default behavior: return latest incident per service
-        # First, get the latest incident per service using a CTE
-        latest_per_service = (
-            select(
-                Incident.service,
-                func.max(Incident.created_at).label('max_created_at')
-            )
-            .group_by(Incident.service)
-            .cte('latest_per_service')
-        )
-
-        # Then join with the main table to get the full incident details
-        query = (
-            base_query
-            .join(
-                latest_per_service,
-                and_(
-                    Incident.service == latest_per_service.c.service,
-                    Incident.created_at == latest_per_service.c.max_created_at
-                )
-            )
-            .order_by(desc(Incident.created_at))
-        )
+        query = latest_per_service_query(base_query)
 
     result = await db.execute(query)
     incidents = result.scalars().all()
     
     return [incident.to_dict() for incident in incidents]
 
-@app.get("/incidents/generate", response_model=IncidentWithHistory)
+@router.get("/status/summary", response_model=StatusSummary)
+async def get_status_summary(request: Request) -> dict:
+    """
+    Get the overall status, each service's status, open incident counts and
+    time since the last transition, served from memory.
+
+    A service's status is the worst state among its open incidents, or
+    operational when none are open.
+    """
+    return request.app.state.state_index.summary()
+
+@router.get("/status/at", response_model=StatusAtResponse)
+async def get_status_at(
+    ts: datetime = Query(
+        ...,
+        description="Point in time (ISO format) to report every service's state at."
+    ),
+    db: AsyncSession = Depends(get_db)
+) -> dict:
+    """
+    Get every service's last transition recorded at or before `ts`.
+
+    This reports the state the service's most recent transition moved it
+    to, which can differ from the status in /status/summary: another
+    incident on the service may still have been open at `ts`.
+    """
+    if ts.tzinfo is not None:
+        # History timestamps are stored as naive UTC
+        ts = ts.astimezone(timezone.utc).replace(tzinfo=None)
+
+    result = await db.execute(status_at_query(ts))
+    entries = result.scalars().all()
+    
+    return {
+        "ts": ts,
+        "services": [
+            {
+                "service": entry.service,
+                "last_transition_to": entry.current_state,
+                "last_transition_from": entry.previous_state,
+                "last_transition_at": entry.recorded_at,
+                "incident_id": entry.incident_id,
+                "title": entry.title
+            }
+            for entry in entries
+        ]
+    }
+
+@router.get("/incidents/generate", response_model=IncidentWithHistory)
 async def generate_random_incident(
+    request: Request,
     state: Optional[str] = Query(
         None,
         description="Desired state for the incident",
-        enum=["operational", "degraded", "outage", "maintenance"]
+        enum=STATES
     ),
     db: AsyncSession = Depends(get_db)
 ) -> dict:
@@ -183,81 +274,15 @@ async def generate_random_incident(
     Generate and create a random incident for testing purposes.
     Optionally specify the desired state of the incident.
     """
-    services = ["api", "database", "web", "auth", "storage", "compute"]
-    states = ["operational", "degraded", "outage", "maintenance"]
-    component_types = ["server", "database", "cache", "load-balancer", "api"]
-    
-    service = random.choice(services)
-    # Use provided state or random if not provided
-    current_state = state if state else random.choice(states)
-    # Ensure previous state is different from current
-    previous_state = random.choice([s for s in states if s != current_state])
-    
-    # Generate 1-3 random components
-    components = random.sample(component_types, random.randint(1, 3))
-    
-    # Generate incident title based on service and state
-    titles = [
-        f"{service.title()} Service {current_state.title()} Detected",
-        f"Unexpected {current_state.title()} in {service.title()} System",
-        f"{service.title()} Performance {current_state.title()}",
-        f"Investigating {service.title()} Service Issues"
-    ]
-    
-    descriptions = [
-        f"Our monitoring system detected {current_state} status in the {service} service affecting {', '.join(components)}.",
-        f"We are investigating reports of {current_state} performance in the {service} system.",
-        f"Engineers are responding to {current_state} alerts from {service} service components.",
-        f"Automated systems detected abnormal behavior in {service} service {components[0]}."
-    ]
-    
-    incident_data = IncidentCreate(
-        service=service,
-        previous_state=previous_state,
-        current_state=current_state,
-        incident=IncidentDetail(
-            title=random.choice(titles),
-            description=random.choice(descriptions),
-            components=components,
-            url=f"https://status.joseserver.com/incidents/{service}-{int(datetime.utcnow().timestamp())}"
-        )
-    )
-    
-    # Use the existing create_incident logic
-    incident = Incident(
-        service=incident_data.service,
-        previous_state=incident_data.previous_state,
-        current_state=incident_data.current_state,
-        title=incident_data.incident.title,
-        description=incident_data.incident.description,
-        components=incident_data.incident.components,
-        url=str(incident_data.incident.url)
-    )
-    
-    db.add(incident)
-    await db.commit()
-    await db.refresh(incident)
-    
-    # Create history entry
-    history_entry = IncidentHistory(
-        incident_id=incident.id,
-        service=incident.service,
-        previous_state=incident.previous_state,
-        current_state=incident.current_state,
-        title=incident.title,
-        description=incident.description,
-        components=incident.components,
-        url=incident.url
-    )
-    
-    db.add(history_entry)
-    await db.commit()
-    await db.refresh(incident)
+    incident_data = IncidentCreate(**random_incident(state=state))
     
+    incident = await record_incident(db, incident_data)
+    after_commit(request.app, incident.history[0], created=True)
     return incident.to_dict()
 
-@app.post("/incidents/{incident_id}/resolve", response_model=IncidentWithHistory)
+@router.post("/incidents/{incident_id}/resolve", response_model=IncidentWithHistory)
 async def resolve_incident(
+    request: Request,
     incident_id: int,
     db: AsyncSession = Depends(get_db)
 ) -> dict:
@@ -292,7 +317,97 @@ async def resolve_incident(
     )
     
     db.add(history_entry)
+    await enqueue_event(db, "incident.resolved", incident_payload(incident))
     await db.commit()
     await db.refresh(incident)
+    after_commit(request.app, history_entry)
     
     return incident.to_dict()
+
+@router.post("/webhooks/subscribers", response_model=WebhookSubscriberResponse)
+async def create_webhook_subscriber(
+    subscriber_data: WebhookSubscriberCreate,
+    db: AsyncSession = Depends(get_db)
+) -> dict:
+    """
+    Register a webhook subscriber. An empty `events` list subscribes to all events.
+    """
+    subscriber = WebhookSubscriber(
+        url=str(subscriber_data.url),
+        events=subscriber_data.events,
+        max_concurrency=subscriber_data.max_concurrency
+    )
+    
+    db.add(subscriber)
+    await db.commit()
+    await db.refresh(subscriber)
+    
+    return subscriber.to_dict()
+
+@router.get("/webhooks/subscribers", response_model=List[WebhookSubscriberResponse])
+async def list_webhook_subscribers(
+    db: AsyncSession = Depends(get_db)
+) -> List[dict]:
+    """
+    List registered webhook subscribers.
+    """
+    result = await db.execute(select(WebhookSubscriber).order_by(WebhookSubscriber.id))
+    return [subscriber.to_dict() for subscriber in result.scalars().all()]
+
+@router.delete("/webhooks/subscribers/{subscriber_id}", status_code=204)
+async def delete_webhook_subscriber(
+    subscriber_id: int,
+    db: AsyncSession = Depends(get_db)
+) -> None:
+    """
+    Remove a webhook subscriber and drop its undelivered events.
+    """
+    subscriber = await db.get(WebhookSubscriber, subscriber_id)
+    
+    if not subscriber:
+        raise HTTPException(
+            status_code=404,
+            detail="Subscriber not found"
+        )
+    
+    await db.execute(delete(WebhookOutbox).where(WebhookOutbox.subscriber_id == subscriber_id))
+    await db.delete(subscriber)
+    await db.commit()
+
+@router.get("/webhooks/metrics", response_model=WebhookMetrics)
+async def get_webhook_metrics(
+    request: Request,
+    db: AsyncSession = Depends(get_db)
+) -> dict:
+    """
+    Webhook outbox depth, queue lag and delivery counters.
+    """
+    return await outbox_metrics(db, getattr(request.app.state, "webhook_dispatcher", None))
+
+def create_app(database_url: Optional[str] = None, echo: Optional[bool] = None) -> FastAPI:
+    """
+    Build the application for `database_url` (default: $DATABASE_URL).
+    Each app owns its database engine, which is created lazily, so this
+    does no I/O.
+    """
+    app = FastAPI(
+        title="Status Service",
+        description="Health check service for joseserver.com",
+        version="0.1.0",
+        lifespan=lifespan
+    )
+    app.state.database = Database(database_url, echo)
+
+    # Configure CORS
+    app.add_middleware(
+        CORSMiddleware,
+        allow_origins=["https://status.joseserver.com"],
+        allow_credentials=True,
+        allow_methods=["*"],
+        allow_headers=["*"]
+    )
+
+    app.include_router(router)
+    return app
+
+app = create_app()
@@ -0,0 +1,4 @@
+# Import all models so their tables and relationships are registered on Base
+from app.models.incident import Incident
+from app.models.history import IncidentHistory
+from app.models.webhook import WebhookSubscriber, WebhookOutbox
@@ -1,11 +1,15 @@
 from datetime import datetime
 from typing import List
-from sqlalchemy import Column, Integer, String, DateTime, JSON, ForeignKey
+from sqlalchemy import Column, Integer, String, DateTime, JSON, ForeignKey, Index
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from app.core.database import Base
 
 class IncidentHistory(Base):
     __tablename__ = "incident_history"
+    __table_args__ = (
+        # Serves "last transition per service at or before T" lookups
+        Index("ix_incident_history_service_recorded_at", "service", "recorded_at"),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True)
     incident_id: Mapped[int] = mapped_column(ForeignKey("incidents.id"))
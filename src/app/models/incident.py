@@ -1,11 +1,16 @@
 from datetime import datetime
 from typing import List
-from sqlalchemy import Column, Integer, String, DateTime, JSON, ForeignKey
+from sqlalchemy import Column, Integer, String, DateTime, JSON, ForeignKey, Index
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from app.core.database import Base
 
 class Incident(Base):
     __tablename__ = "incidents"
+    __table_args__ = (
+        # Serve "most recent incidents" and "latest incident per service" reads
+        Index("ix_incidents_created_at", "created_at"),
+        Index("ix_incidents_service_created_at", "service", "created_at"),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True)
     service: Mapped[str] = mapped_column(String(100))
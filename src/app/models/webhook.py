@@ -0,0 +1,54 @@
+from datetime import datetime
+from typing import List, Optional
+from sqlalchemy import String, DateTime, JSON, ForeignKey, Index
+from sqlalchemy.orm import Mapped, mapped_column
+from app.core.database import Base
+
+class WebhookSubscriber(Base):
+    __tablename__ = "webhook_subscribers"
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    url: Mapped[str] = mapped_column(String(500))
+    # Event types to deliver; an empty list subscribes to every event
+    events: Mapped[List[str]] = mapped_column(JSON, default=list)
+    max_concurrency: Mapped[int] = mapped_column(default=2)
+    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+
+    def wants(self, event_type: str) -> bool:
+        """Whether this subscriber should receive `event_type`."""
+        return not self.events or event_type in self.events
+
+    def to_dict(self):
+        """Convert the subscriber to a dictionary."""
+        return {
+            "id": self.id,
+            "url": self.url,
+            "events": self.events,
+            "max_concurrency": self.max_concurrency,
+            "created_at": self.created_at
+        }
+
+class WebhookOutbox(Base):
+    """
+    A pending webhook delivery, written in the same transaction as the
+    change it describes so that no committed event is ever lost.
+    """
+    __tablename__ = "webhook_outbox"
+    __table_args__ = (
+        Index("ix_webhook_outbox_status_next_attempt_at", "status", "next_attempt_at"),
+        # Serves the per-subscriber claim query
+        Index("ix_webhook_outbox_subscriber_id", "subscriber_id"),
+    )
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    subscriber_id: Mapped[int] = mapped_column(ForeignKey("webhook_subscribers.id"))
+    event_type: Mapped[str] = mapped_column(String(50))
+    payload: Mapped[dict] = mapped_column(JSON)
+    # pending -> in_flight, then deleted once delivered, or back to pending until failed
+    status: Mapped[str] = mapped_column(String(20), default="pending")
+    attempts: Mapped[int] = mapped_column(default=0)
+    last_error: Mapped[Optional[str]] = mapped_column(String(500), nullable=True)
+    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+    # When pending, the earliest time to attempt delivery; when in flight, the
+    # end of the claim lease after which the row is delivered again
+    next_attempt_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
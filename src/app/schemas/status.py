@@ -0,0 +1,30 @@
+from datetime import datetime
+from typing import List, Optional
+from pydantic import BaseModel
+
+class ServiceStateAt(BaseModel):
+    # The service's last transition at or before the requested time
+    service: str
+    last_transition_to: str
+    last_transition_from: str
+    last_transition_at: datetime
+    incident_id: int
+    title: str
+
+class StatusAtResponse(BaseModel):
+    ts: datetime
+    services: List[ServiceStateAt]
+
+class ServiceSummary(BaseModel):
+    service: str
+    # Worst state among the service's open incidents, or operational
+    status: str
+    open_incidents: int
+    last_transition_at: Optional[datetime]
+    seconds_since_transition: Optional[float]
+
+class StatusSummary(BaseModel):
+    status: str
+    open_incidents: int
+    reconciled_at: Optional[datetime]
+    services: List[ServiceSummary]
@@ -0,0 +1,29 @@
+from datetime import datetime
+from typing import List, Optional
+from pydantic import BaseModel, Field, HttpUrl
+
+class WebhookSubscriberCreate(BaseModel):
+    url: HttpUrl
+    events: List[str] = []
+    max_concurrency: int = Field(2, ge=1, le=16)
+
+class WebhookSubscriberResponse(BaseModel):
+    id: int
+    url: str
+    events: List[str]
+    max_concurrency: int
+    created_at: datetime
+
+    class Config:
+        from_attributes = True
+
+class WebhookMetrics(BaseModel):
+    pending: int
+    in_flight: int
+    failed: int
+    oldest_pending_at: Optional[datetime]
+    queue_lag_seconds: float
+    batches_sent: int
+    events_delivered: int
+    events_retried: int
+    events_failed: int
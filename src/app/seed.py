@@ -0,0 +1,232 @@
+"""
+Seed the database with synthetic incidents for capacity testing.
+
+Incidents are generated with the same logic as GET /incidents/generate and
+given realistic multi-step histories (flapping, resolved incidents, long
+outages). Rows are written with bulk inserts in large transactions, and the
+same --seed and --end always produce the same database.
+
+Usage (from src/):
+    python -m app.seed --count 1000000 --days 365 --seed 42
+    python -m app.seed --rate 30 --days 30 --end 2025-01-01
+"""
+import argparse
+import json
+import random
+import sys
+import time
+from datetime import datetime, timedelta
+from typing import Iterator, List, Optional, Tuple
+
+from sqlalchemy import Table, create_engine, func, select
+
+from app.core.database import Base, DATABASE_URL
+from app.core.generator import random_incident, STATES
+from app.models.incident import Incident
+from app.models.history import IncidentHistory
+
+# Relative weights of the incident lifecycles that are generated
+SCENARIOS = {
+    "open": 1,
+    "resolved": 6,
+    "flapping": 2,
+    "long_outage": 1
+}
+
+DEGRADED_STATES = [s for s in STATES if s != "operational"]
+
+def transitions(rng: random.Random, scenario: str, first_state: str) -> List[Tuple[str, timedelta]]:
+    """
+    Return the states an incident moves through after its first one, each
+    with its delay since the previous transition.
+    """
+    if scenario == "open":
+        return []
+
+    if scenario == "resolved":
+        return [("operational", timedelta(minutes=rng.randint(5, 240)))]
+
+    if scenario == "flapping":
+        steps = []
+        state = first_state
+        for _ in range(rng.randint(2, 8)):
+            state = "degraded" if state == "operational" else "operational"
+            steps.append((state, timedelta(minutes=rng.randint(1, 15))))
+        if state != "operational":
+            steps.append(("operational", timedelta(minutes=rng.randint(5, 60))))
+        return steps
+
+    if scenario == "long_outage":
+        steps = [("degraded", timedelta(hours=rng.randint(6, 72)))]
+        steps.append(("operational", timedelta(hours=rng.randint(1, 12))))
+        return steps
+
+    raise ValueError(f"Unknown scenario: {scenario}")
+
+def generate(
+    rng: random.Random,
+    count: int,
+    start: datetime,
+    end: datetime,
+    first_id: int = 1
+) -> Iterator[Tuple[dict, List[dict]]]:
+    """
+    Yield `count` incident rows with their history rows, with creation times
+    spread randomly over [start, end) in chronological order. Transitions
+    that would fall at or after `end` are dropped, leaving those incidents
+    in their last earlier state.
+    """
+    span = (end - start).total_seconds()
+    offsets = sorted(rng.random() * span for _ in range(count))
+    scenarios = list(SCENARIOS)
+    weights = list(SCENARIOS.values())
+
+    for n, offset in enumerate(offsets):
+        incident_id = first_id + n
+        created_at = start + timedelta(seconds=offset)
+        scenario = rng.choices(scenarios, weights)[0]
+        state = "outage" if scenario == "long_outage" else rng.choice(DEGRADED_STATES)
+
+        data = random_incident(rng, state=state, now=created_at)
+        detail = data["incident"]
+        common = {
+            "service": data["service"],
+            "title": detail["title"],
+            "description": detail["description"],
+            "components": detail["components"],
+            "url": detail["url"]
+        }
+
+        history = [{
+            "incident_id": incident_id,
+            "recorded_at": created_at,
+            "previous_state": data["previous_state"],
+            "current_state": data["current_state"],
+            **common
+        }]
+        recorded_at = created_at
+        for next_state, delay in transitions(rng, scenario, data["current_state"]):
+            recorded_at += delay
+            if recorded_at >= end:
+                break
+            history.append({
+                "incident_id": incident_id,
+                "recorded_at": recorded_at,
+                "previous_state": history[-1]["current_state"],
+                "current_state": next_state,
+                **common
+            })
+
+        incident = {
+            "id": incident_id,
+            "created_at": created_at,
+            "previous_state": history[-1]["previous_state"],
+            "current_state": history[-1]["current_state"],
+            **common
+        }
+        yield incident, history
+
+def bulk_insert(conn, table: Table, rows: List[dict]) -> None:
+    """
+    Insert `rows` with a single executemany on the DBAPI cursor.
+
+    Values are converted the way SQLAlchemy stores them on SQLite, but once
+    per distinct object rather than once per bound parameter, which is where
+    most of the time goes when inserting millions of rows through the ORM types.
+    """
+    columns = [c.name for c in table.columns if c.name in rows[0]]
+    sql = (
+        f"INSERT INTO {table.name} ({', '.join(columns)}) "
+        f"VALUES ({', '.join('?' for _ in columns)})"
+    )
+
+    encoded = {}
+    def encode(value):
+        if isinstance(value, datetime):
+            return value.strftime("%Y-%m-%d %H:%M:%S.%f")
+        if isinstance(value, list):
+            # History rows share their incident's components list
+            key = id(value)
+            if key not in encoded:
+                encoded[key] = json.dumps(value)
+            return encoded[key]
+        return value
+
+    conn.exec_driver_sql(sql, [tuple(encode(row[c]) for c in columns) for row in rows])
+
+def seed(
+    database_url: str,
+    count: int,
+    start: datetime,
+    end: datetime,
+    seed: int = 0,
+    batch_size: int = 50_000,
+    progress: bool = False
+) -> Tuple[int, int]:
+    """
+    Write `count` synthetic incidents to `database_url`, committing every
+    `batch_size` incidents. Returns the number of incident and history rows.
+    """
+    # Bulk inserts go through the synchronous driver; the async one only adds overhead here
+    engine = create_engine(database_url.replace("+aiosqlite", ""))
+    Base.metadata.create_all(engine)
+
+    rng = random.Random(seed)
+    incidents_written = history_written = 0
+    began = time.perf_counter()
+
+    with engine.connect() as conn:
+        with conn.begin():
+            first_id = (conn.execute(select(func.max(Incident.id))).scalar() or 0) + 1
+        incidents: List[dict] = []
+        history: List[dict] = []
+
+        def flush():
+            nonlocal incidents_written, history_written
+            with conn.begin():
+                bulk_insert(conn, Incident.__table__, incidents)
+                bulk_insert(conn, IncidentHistory.__table__, history)
+            incidents_written += len(incidents)
+            history_written += len(history)
+            incidents.clear()
+            history.clear()
+            if progress:
+                elapsed = time.perf_counter() - began
+                print(f"{incidents_written}/{count} incidents ({incidents_written / elapsed:,.0f}/s)", file=sys.stderr)
+
+        for incident, entries in generate(rng, count, start, end, first_id):
+            incidents.append(incident)
+            history.extend(entries)
+            if len(incidents) >= batch_size:
+                flush()
+        if incidents:
+            flush()
+
+    engine.dispose()
+    return incidents_written, history_written
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    volume = parser.add_mutually_exclusive_group(required=True)
+    volume.add_argument("--count", type=int, help="number of incidents to create")
+    volume.add_argument("--rate", type=float, help="incidents per hour over the time span")
+    parser.add_argument("--days", type=float, default=365, help="time span covered, in days (default: 365)")
+    parser.add_argument("--end", type=datetime.fromisoformat, default=None,
+                        help="end of the time span, ISO format (default: now)")
+    parser.add_argument("--seed", type=int, default=0, help="random seed (default: 0)")
+    parser.add_argument("--batch-size", type=int, default=50_000, help="incidents per transaction (default: 50000)")
+    parser.add_argument("--database-url", default=DATABASE_URL, help="database to seed (default: $DATABASE_URL)")
+    return parser.parse_args(argv)
+
+def main(argv: Optional[List[str]] = None) -> None:
+    args = parse_args(argv)
+    end = args.end if args.end else datetime.utcnow().replace(microsecond=0)
+    start = end - timedelta(days=args.days)
+    count = args.count if args.count is not None else int(args.rate * args.days * 24)
+
+    began = time.perf_counter()
+    incidents, history = seed(args.database_url, count, start, end, args.seed, args.batch_size, progress=True)
+    print(f"Seeded {incidents} incidents and {history} history entries in {time.perf_counter() - began:.1f}s")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""
+Benchmark cold start: time from launching the server process (including
+imports) until it serves its first request.
+
+The first boot runs against a fresh database and applies the schema; later
+boots run against the same database seeded with --incidents incidents, find
+the schema version current and skip DDL. Readiness should not grow with the
+number of incidents.
+
+Usage (from src/):
+    python -m benchmarks.bench_startup --runs 5 --incidents 300000
+"""
+import argparse
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import httpx
+
+from app.seed import seed
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+def boot(database_url: str, timeout: float = 60.0) -> dict:
+    """Start the server and time readiness and the first real request."""
+    port = free_port()
+    env = dict(os.environ, DATABASE_URL=database_url)
+    began = time.perf_counter()
+    process = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(port), "--log-level", "warning"],
+        env=env
+    )
+    timings = {}
+    try:
+        with httpx.Client(base_url=f"http://127.0.0.1:{port}") as client:
+            while "ready" not in timings:
+                if time.perf_counter() - began > timeout:
+                    raise TimeoutError("server did not become ready")
+                try:
+                    if client.get("/ready").status_code == 200:
+                        timings["ready"] = time.perf_counter() - began
+                except httpx.TransportError:
+                    time.sleep(0.005)
+
+            response = client.get("/incidents/recent")
+            response.raise_for_status()
+            timings["first_request"] = time.perf_counter() - began
+    finally:
+        process.terminate()
+        process.wait()
+    return timings
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5, help="boots against an existing database")
+    parser.add_argument("--incidents", type=int, default=300_000,
+                        help="incidents to seed before the warm boots (default: 300000)")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        database_url = f"sqlite+aiosqlite:///{Path(tmp) / 'startup.db'}"
+
+        first = boot(database_url)
+        print(f"fresh database: ready {first['ready'] * 1000:.0f} ms, "
+              f"first request {first['first_request'] * 1000:.0f} ms")
+
+        if args.incidents:
+            end = datetime(2025, 1, 1)
+            seed(database_url, args.incidents, end - timedelta(days=365), end)
+
+        runs = [boot(database_url) for _ in range(args.runs)]
+        ready = statistics.median(r["ready"] for r in runs)
+        first_request = statistics.median(r["first_request"] for r in runs)
+        print(f"existing database ({args.runs} runs, median): ready {ready * 1000:.0f} ms, "
+              f"first request {first_request * 1000:.0f} ms")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+"""
+Benchmark GET /status/at lookups against a large incident history.
+
+Usage (from src/):
+    python -m benchmarks.bench_status_at --rows 1000000
+"""
+import argparse
+import asyncio
+import random
+import sqlite3
+import statistics
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+from sqlalchemy import create_engine, select
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.core.database import Base
+from app.core.queries import status_at_query
+from app.models.history import IncidentHistory
+
+SERVICES = ["api", "database", "web", "auth", "storage", "compute"]
+STATES = ["operational", "degraded", "outage", "maintenance"]
+
+def populate(path: Path, rows: int, seed: int, start: datetime, span: timedelta) -> None:
+    """Fill `path` with `rows` history entries spread evenly over `span`."""
+    engine = create_engine(f"sqlite:///{path}")
+    Base.metadata.create_all(engine)
+    engine.dispose()
+
+    rng = random.Random(seed)
+    step = span / rows
+    conn = sqlite3.connect(path)
+    conn.execute("PRAGMA journal_mode=OFF")
+    conn.execute("PRAGMA synchronous=OFF")
+    with conn:
+        conn.executemany(
+            "INSERT INTO incident_history (incident_id, recorded_at, service, previous_state, "
+            "current_state, title, description, components, url) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (
+                (
+                    i // 4 + 1,
+                    (start + step * i).strftime("%Y-%m-%d %H:%M:%S.%f"),
+                    rng.choice(SERVICES),
+                    rng.choice(STATES),
+                    rng.choice(STATES),
+                    "Benchmark incident",
+                    "Benchmark incident",
+                    '["server"]',
+                    "https://status.joseserver.com/incidents/bench"
+                )
+                for i in range(rows)
+            )
+        )
+    conn.close()
+
+async def replay(session: AsyncSession, ts: datetime) -> dict:
+    """The naive approach: read the whole history and replay it."""
+    states = {}
+    result = await session.stream(
+        select(IncidentHistory.service, IncidentHistory.current_state)
+        .filter(IncidentHistory.recorded_at <= ts)
+        .order_by(IncidentHistory.recorded_at, IncidentHistory.id)
+    )
+    async for service, state in result:
+        states[service] = state
+    return states
+
+async def run(path: Path, lookups: int, seed: int, start: datetime, span: timedelta) -> None:
+    engine = create_async_engine(f"sqlite+aiosqlite:///{path}")
+    session_factory = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    rng = random.Random(seed)
+
+    async with session_factory() as session:
+        timings = []
+        for _ in range(lookups):
+            ts = start + span * rng.random()
+            began = time.perf_counter()
+            result = await session.execute(status_at_query(ts))
+            entries = result.scalars().all()
+            timings.append(time.perf_counter() - began)
+
+        print(f"status_at: {lookups} lookups, {len(entries)} services")
+        print(f"  median {statistics.median(timings) * 1000:.2f} ms, "
+              f"p95 {sorted(timings)[int(len(timings) * 0.95) - 1] * 1000:.2f} ms")
+
+        ts = start + span
+        began = time.perf_counter()
+        states = await replay(session, ts)
+        print(f"full replay (for comparison): {(time.perf_counter() - began) * 1000:.2f} ms")
+
+        result = await session.execute(status_at_query(ts))
+        expected = {entry.service: entry.current_state for entry in result.scalars()}
+        assert states == expected, "status_at disagrees with a full replay"
+
+    await engine.dispose()
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=1_000_000, help="history rows to generate")
+    parser.add_argument("--lookups", type=int, default=200, help="point-in-time lookups to time")
+    parser.add_argument("--years", type=float, default=3.0, help="time span covered by the history")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    span = timedelta(days=365 * args.years)
+    start = datetime(2020, 1, 1)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "bench.db"
+        began = time.perf_counter()
+        populate(path, args.rows, args.seed, start, span)
+        print(f"populated {args.rows} history rows in {time.perf_counter() - began:.1f} s")
+        asyncio.run(run(path, args.lookups, args.seed, start, span))
+
+if __name__ == "__main__":
+    main()
@@ -32,6 +32,13 @@ export interface IncidentHistory {
   };
 }
 
+export interface StatusSnapshot {
+  generated_at: string;
+  recent_limit: number;
+  latest: Incident[];
+  recent: Incident[];
+}
+
 const api = axios.create({
   baseURL: API_URL,
   headers: {
@@ -39,7 +46,21 @@ const api = axios.create({
   },
 });
 
+// Pre-rendered by the backend and served directly by nginx
+const getStatusSnapshot = async () => {
+  const response = await axios.get<StatusSnapshot>('/status.json');
+  return response.data;
+};
+
 export const getRecentIncidents = async (count = 10) => {
+  try {
+    const snapshot = await getStatusSnapshot();
+    if (Array.isArray(snapshot.recent) && count <= snapshot.recent_limit) {
+      return snapshot.recent.slice(0, count);
+    }
+  } catch {
+    // Snapshot unavailable, fall back to the API
+  }
   const response = await api.get<Incident[]>(`/incidents/recent?count=${count}`);
   return response.data;
 };
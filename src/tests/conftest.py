@@ -0,0 +1,16 @@
+import pytest_asyncio
+
+from app.core.database import Database
+
+@pytest_asyncio.fixture
+async def session_factory(tmp_path):
+    """
+    Session factory for a fresh database. A file database is used so that
+    background workers can hold several connections at once.
+    """
+    database = Database(f"sqlite+aiosqlite:///{tmp_path / 'test.db'}")
+    await database.init()
+
+    yield database.sessionmaker
+
+    await database.dispose()
@@ -0,0 +1,52 @@
+from datetime import datetime
+from typing import Optional
+
+from app.models.incident import Incident
+from app.models.history import IncidentHistory
+
+async def add_incident(
+    session_factory,
+    service: str,
+    state: str,
+    at: Optional[datetime] = None,
+    incident_id: Optional[int] = None
+) -> IncidentHistory:
+    """
+    Create an incident in `state`, or move incident `incident_id` to it,
+    recording the history entry the way the API does. Returns the entry.
+    """
+    at = at if at else datetime.utcnow()
+    async with session_factory() as session:
+        if incident_id is None:
+            incident = Incident(
+                service=service,
+                previous_state="operational",
+                current_state=state,
+                created_at=at,
+                title=f"{service} {state}",
+                description="Test incident",
+                components=["api"],
+                url="https://status.test-service.com/incident"
+            )
+            session.add(incident)
+            await session.flush()
+        else:
+            incident = await session.get(Incident, incident_id)
+            incident.previous_state = incident.current_state
+            incident.current_state = state
+
+        entry = IncidentHistory(
+            incident_id=incident.id,
+            recorded_at=at,
+            service=incident.service,
+            previous_state=incident.previous_state,
+            current_state=incident.current_state,
+            title=incident.title,
+            description=incident.description,
+            components=incident.components,
+            url=incident.url
+        )
+        session.add(entry)
+        await session.commit()
+
+    return entry
@@ -1,7 +1,10 @@
 import pytest
 from fastapi.testclient import TestClient
 from datetime import datetime
-from app.main import app
+from sqlalchemy import text
+
+from app.core.database import SCHEMA_VERSION, Database
+from app.main import create_app
 
 test_cases = [
     {
@@ -13,7 +16,11 @@ test_cases = [
 ]
 
 @pytest.fixture
-def client():
+def app(tmp_path):
+    return create_app(database_url=f"sqlite+aiosqlite:///{tmp_path / 'incidents.db'}")
+
+@pytest.fixture
+def client(app):
     """
     Test client fixture that ensures proper application lifecycle.
     """
@@ -22,7 +29,7 @@ def client():
         yield client
 
 @pytest.mark.parametrize("test_case", test_cases, ids=lambda t: t["name"])
-def test_health_endpoint(client, test_case):
+def test_health_endpoint(app, client, test_case):
     response = client.get(test_case["endpoint"])
     
     # Check status code
@@ -39,4 +46,50 @@ def test_health_endpoint(client, test_case):
     assert isinstance(data["timestamp"], str)
     
     # Verify timestamp is a valid datetime string
-    datetime.fromisoformat(data["timestamp"])
\ No newline at end of file
+    datetime.fromisoformat(data["timestamp"])
+
+def test_ready_endpoint(client):
+    response = client.get("/ready")
+    assert response.status_code == 200
+    assert response.json() == {"status": "ready"}
+
+def test_ready_endpoint_before_startup(app):
+    # Without the lifespan having run, the app is alive but not ready
+    client = TestClient(app)
+    assert client.get("/ready").status_code == 503
+
+@pytest.mark.asyncio
+async def test_database_init_skips_ddl_when_schema_is_current(tmp_path):
+    database = Database(f"sqlite+aiosqlite:///{tmp_path / 'schema.db'}")
+
+    assert await database.init() is True
+    async with database.engine.connect() as conn:
+        assert (await conn.execute(text("PRAGMA user_version"))).scalar() == SCHEMA_VERSION
+
+    assert await database.init() is False
+    await database.dispose()
+
+@pytest.mark.asyncio
+async def test_database_init_adds_indexes_to_older_schema(tmp_path):
+    database = Database(f"sqlite+aiosqlite:///{tmp_path / 'schema.db'}")
+    await database.init()
+    async with database.engine.begin() as conn:
+        await conn.execute(text("DROP INDEX ix_incidents_created_at"))
+        await conn.execute(text(f"PRAGMA user_version = {SCHEMA_VERSION - 1}"))
+
+    assert await database.init() is True
+    async with database.engine.connect() as conn:
+        indexes = (await conn.execute(text("PRAGMA index_list(incidents)"))).all()
+    assert "ix_incidents_created_at" in {row[1] for row in indexes}
+    await database.dispose()
+
+@pytest.mark.asyncio
+async def test_apps_keep_their_own_database(tmp_path):
+    first = create_app(database_url=f"sqlite+aiosqlite:///{tmp_path / 'first.db'}")
+    second = create_app(database_url=f"sqlite+aiosqlite:///{tmp_path / 'second.db'}")
+
+    assert first.state.database.url.endswith("first.db")
+    assert second.state.database.url.endswith("second.db")
+    assert first.state.database.engine is not second.state.database.engine
+    await first.state.database.dispose()
+    await second.state.database.dispose()
@@ -1,5 +1,4 @@
 import pytest
-import pytest_asyncio
 import time
 from datetime import datetime, timedelta
 
@@ -7,49 +6,13 @@ def wait(seconds):
     """Helper function to add delay between operations"""
     time.sleep(seconds)
 from fastapi.testclient import TestClient
-from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
-from sqlalchemy.orm import sessionmaker
-
-from app.core.database import Base
-from app.main import app, get_db
-
-# Use an in-memory SQLite database for testing
-TEST_DATABASE_URL = "sqlite+aiosqlite:///:memory:"
-
-engine = create_async_engine(
-    TEST_DATABASE_URL,
-    echo=True,
-    connect_args={"check_same_thread": False}
-)
-
-TestingSessionLocal = sessionmaker(
-    engine,
-    class_=AsyncSession,
-    expire_on_commit=False
-)
-
-@pytest_asyncio.fixture
-async def db_session():
-    async with engine.begin() as conn:
-        await conn.run_sync(Base.metadata.create_all)
-    
-    async with TestingSessionLocal() as session:
-        yield session
-        
-    async with engine.begin() as conn:
-        await conn.run_sync(Base.metadata.drop_all)
 
-@pytest.fixture
-def override_get_db(db_session):
-    async def _override_get_db():
-        yield db_session
-    
-    app.dependency_overrides[get_db] = _override_get_db
-    yield
-    app.dependency_overrides.clear()
+from app.main import create_app
 
 @pytest.fixture
-def test_client(override_get_db):
+def test_client(tmp_path):
+    # Each test gets its own database file
+    app = create_app(database_url=f"sqlite+aiosqlite:///{tmp_path / 'incidents.db'}")
     with TestClient(app) as client:
         yield client
 
@@ -293,3 +256,121 @@ def test_get_recent_incidents_latest_per_service(test_client):
     assert len(service_a_incidents) == 1
     # Should be the latest state (operational)
     assert service_a_incidents[0]["current_state"] == "operational"
+
+@pytest.fixture
+def no_webhook_workers(monkeypatch):
+    # Keep events in the outbox instead of delivering them
+    monkeypatch.setattr("app.main.WEBHOOK_WORKERS", 0)
+
+def test_incident_writes_enqueue_webhooks(no_webhook_workers, test_client):
+    response = test_client.post("/webhooks/subscribers", json={
+        "url": "https://hooks.test-service.com/status",
+        "events": ["incident.created", "incident.resolved"]
+    })
+    assert response.status_code == 200
+    subscriber = response.json()
+    assert subscriber["max_concurrency"] == 2
+
+    response = test_client.post("/incidents", json=test_cases[0]["payload"])
+    assert response.status_code == 200
+    incident_id = response.json()["id"]
+
+    response = test_client.post(f"/incidents/{incident_id}/resolve")
+    assert response.status_code == 200
+
+    # Both events are in the outbox waiting for delivery
+    response = test_client.get("/webhooks/metrics")
+    assert response.status_code == 200
+    assert response.json()["pending"] == 2
+
+    # Removing the subscriber drops its undelivered events
+    response = test_client.delete(f"/webhooks/subscribers/{subscriber['id']}")
+    assert response.status_code == 204
+    assert test_client.get("/webhooks/subscribers").json() == []
+    assert test_client.get("/webhooks/metrics").json()["pending"] == 0
+
+def test_get_status_at(test_client):
+    def create(service, current_state):
+        payload = test_cases[0]["payload"].copy()
+        payload.update(service=service, previous_state="operational", current_state=current_state)
+        response = test_client.post("/incidents", json=payload)
+        assert response.status_code == 200
+        wait(0.1)  # Ensure distinct timestamps
+        return response.json()["id"]
+
+    before_any = datetime.utcnow().isoformat()
+    wait(0.1)
+
+    api_incident = create("api", "outage")
+    create("web", "degraded")
+    after_outage = datetime.utcnow().isoformat()
+    wait(0.1)
+
+    response = test_client.post(f"/incidents/{api_incident}/resolve")
+    assert response.status_code == 200
+    wait(0.1)
+
+    def states_at(ts):
+        response = test_client.get("/status/at", params={"ts": ts})
+        assert response.status_code == 200
+        return {s["service"]: s["last_transition_to"] for s in response.json()["services"]}
+
+    assert states_at(before_any) == {}
+    assert states_at(after_outage) == {"api": "outage", "web": "degraded"}
+    assert states_at(datetime.utcnow().isoformat()) == {"api": "operational", "web": "degraded"}
+
+    # Timezone-aware timestamps are interpreted in UTC
+    assert states_at(after_outage + "+00:00") == {"api": "outage", "web": "degraded"}
+
+def test_get_status_at_requires_ts(test_client):
+    response = test_client.get("/status/at")
+    assert response.status_code == 422
+
+def test_get_status_summary(test_client):
+    response = test_client.get("/status/summary")
+    assert response.status_code == 200
+    assert response.json()["status"] == "operational"
+    assert response.json()["services"] == []
+
+    payload = test_cases[0]["payload"].copy()
+    payload.update(service="api", previous_state="operational", current_state="outage")
+    response = test_client.post("/incidents", json=payload)
+    assert response.status_code == 200
+    incident_id = response.json()["id"]
+
+    payload.update(service="web", current_state="degraded")
+    assert test_client.post("/incidents", json=payload).status_code == 200
+
+    summary = test_client.get("/status/summary").json()
+    assert summary["status"] == "outage"
+    assert summary["open_incidents"] == 2
+    services = {s["service"]: s for s in summary["services"]}
+    assert services["api"]["status"] == "outage"
+    assert services["api"]["open_incidents"] == 1
+    assert services["api"]["seconds_since_transition"] >= 0
+
+    assert test_client.post(f"/incidents/{incident_id}/resolve").status_code == 200
+
+    summary = test_client.get("/status/summary").json()
+    assert summary["status"] == "degraded"
+    assert summary["open_incidents"] == 1
+    services = {s["service"]: s for s in summary["services"]}
+    assert services["api"]["status"] == "operational"
+    assert services["api"]["open_incidents"] == 0
+
+def test_status_summary_and_status_at_differ_with_overlapping_incidents(test_client):
+    payload = test_cases[0]["payload"].copy()
+    payload.update(service="api", previous_state="operational", current_state="outage")
+    assert test_client.post("/incidents", json=payload).status_code == 200
+    wait(0.1)
+
+    payload.update(current_state="degraded")
+    response = test_client.post("/incidents", json=payload)
+    assert test_client.post(f"/incidents/{response.json()['id']}/resolve").status_code == 200
+
+    # The outage is still open, though the latest transition resolved the other incident
+    summary = test_client.get("/status/summary").json()
+    assert summary["services"][0]["status"] == "outage"
+
+    response = test_client.get("/status/at", params={"ts": datetime.utcnow().isoformat()})
+    assert response.json()["services"][0]["last_transition_to"] == "operational"
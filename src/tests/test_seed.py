@@ -0,0 +1,87 @@
+import sqlite3
+import time
+from datetime import datetime, timedelta
+import random
+
+from app.core.generator import STATES
+from app.seed import generate, seed
+
+START = datetime(2024, 1, 1)
+END = datetime(2025, 1, 1)
+
+def test_generate_is_deterministic():
+    first = list(generate(random.Random(7), 200, START, END))
+    second = list(generate(random.Random(7), 200, START, END))
+    other = list(generate(random.Random(8), 200, START, END))
+
+    assert first == second
+    assert first != other
+
+def test_generate_builds_consistent_histories():
+    incidents = list(generate(random.Random(1), 500, START, END, first_id=10))
+
+    assert [incident["id"] for incident, _ in incidents] == list(range(10, 510))
+    created = [incident["created_at"] for incident, _ in incidents]
+    assert created == sorted(created)
+    assert START <= created[0] and created[-1] < END
+
+    lengths = set()
+    for incident, history in incidents:
+        lengths.add(len(history))
+        assert history[0]["recorded_at"] == incident["created_at"]
+        assert history[-1]["recorded_at"] < END
+        for previous, entry in zip(history, history[1:]):
+            assert entry["previous_state"] == previous["current_state"]
+            assert entry["recorded_at"] > previous["recorded_at"]
+        assert all(entry["incident_id"] == incident["id"] for entry in history)
+        assert all(entry["current_state"] in STATES for entry in history)
+        assert incident["current_state"] == history[-1]["current_state"]
+        assert incident["previous_state"] == history[-1]["previous_state"]
+
+    # Open, resolved, flapping and long outage incidents are all represented
+    assert {1, 2, 3} <= lengths
+    assert max(lengths) > 3
+
+    # Over a short span, transitions past the end are dropped rather than written in the future
+    short = list(generate(random.Random(1), 200, END - timedelta(hours=6), END))
+    assert all(history[-1]["recorded_at"] < END for _, history in short)
+
+def test_seed_writes_in_batches(tmp_path):
+    path = tmp_path / "seed.db"
+    url = f"sqlite+aiosqlite:///{path}"
+
+    incidents, history = seed(url, 250, START, END, seed=3, batch_size=100)
+    assert incidents == 250
+    assert history >= 250
+
+    # Seeding again appends after the existing incidents
+    seed(url, 50, START, END, seed=4, batch_size=100)
+
+    conn = sqlite3.connect(path)
+    assert conn.execute("SELECT count(*), max(id) FROM incidents").fetchone() == (300, 300)
+    assert conn.execute("SELECT count(DISTINCT incident_id) FROM incident_history").fetchone() == (300,)
+    created_at, components = conn.execute(
+        "SELECT created_at, components FROM incidents WHERE id = 1"
+    ).fetchone()
+    conn.close()
+
+    # Stored in the same format SQLAlchemy uses
+    assert datetime.fromisoformat(created_at)
+    assert len(created_at) == len("2024-01-01 00:00:00.000000")
+    assert components.startswith("[")
+
+def test_generate_does_not_depend_on_host_timezone(monkeypatch):
+    def urls():
+        return [incident["url"] for incident, _ in generate(random.Random(5), 50, START, END)]
+
+    monkeypatch.setenv("TZ", "UTC")
+    time.tzset()
+    expected = urls()
+
+    monkeypatch.setenv("TZ", "America/New_York")
+    time.tzset()
+    try:
+        assert urls() == expected
+    finally:
+        monkeypatch.undo()
+        time.tzset()
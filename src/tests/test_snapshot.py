@@ -0,0 +1,58 @@
+import json
+import os
+import stat
+
+import pytest
+
+from app.core.snapshot import SnapshotWriter
+from tests.helpers import add_incident
+
+@pytest.mark.asyncio
+async def test_rebuild_writes_snapshot(session_factory, tmp_path):
+    await add_incident(session_factory, "api", "outage")
+    await add_incident(session_factory, "api", "degraded")
+    await add_incident(session_factory, "web", "maintenance")
+
+    path = tmp_path / "snapshot" / "status.json"
+    writer = SnapshotWriter(session_factory, str(path), recent_count=2)
+    await writer.rebuild()
+
+    snapshot = json.loads(path.read_text())
+    assert snapshot["recent_limit"] == 2
+    assert len(snapshot["recent"]) == 2
+
+    latest = {incident["service"]: incident["current_state"] for incident in snapshot["latest"]}
+    assert latest == {"api": "degraded", "web": "maintenance"}
+    assert len(snapshot["latest"][0]["history"]) == 1
+
+    # The web server must be able to read the file, and no temp files are left behind
+    assert stat.S_IMODE(os.stat(path).st_mode) == 0o644
+    assert os.listdir(path.parent) == ["status.json"]
+
+@pytest.mark.asyncio
+async def test_schedule_debounces_rebuilds(session_factory, tmp_path):
+    path = tmp_path / "status.json"
+    writer = SnapshotWriter(session_factory, str(path), debounce_seconds=0.05)
+
+    rebuilds = 0
+    rebuild = writer.rebuild
+
+    async def counting_rebuild():
+        nonlocal rebuilds
+        rebuilds += 1
+        await rebuild()
+
+    writer.rebuild = counting_rebuild
+
+    for _ in range(10):
+        await add_incident(session_factory, "api", "outage")
+
+    # Writes arriving within the debounce window share a single rebuild
+    for _ in range(10):
+        writer.schedule()
+    await writer._task
+    assert rebuilds == 1
+    assert len(json.loads(path.read_text())["recent"]) == 10
+
+    await writer.close()
+    assert rebuilds == 1
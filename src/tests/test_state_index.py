@@ -0,0 +1,109 @@
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.state_index import StateIndex
+from tests.helpers import add_incident
+
+async def write(session_factory, index, service, state, at, incident_id=None):
+    """Create an incident, or move an existing one to `state`, and record it in `index`."""
+    entry = await add_incident(session_factory, service, state, at, incident_id)
+    index.record(entry, created=incident_id is None)
+    return entry.incident_id
+
+def states(summary):
+    return {
+        s["service"]: (s["status"], s["open_incidents"])
+        for s in summary["services"]
+    }
+
+@pytest.mark.asyncio
+async def test_empty_index_is_operational(session_factory):
+    index = StateIndex(session_factory)
+    await index.load()
+
+    summary = index.summary()
+    assert summary["status"] == "operational"
+    assert summary["open_incidents"] == 0
+    assert summary["services"] == []
+
+@pytest.mark.asyncio
+async def test_record_tracks_writes_and_matches_reload(session_factory):
+    index = StateIndex(session_factory)
+    await index.load()
+    start = datetime.utcnow() - timedelta(hours=1)
+
+    api_outage = await write(session_factory, index, "api", "outage", start)
+    await write(session_factory, index, "api", "degraded", start + timedelta(minutes=1))
+    await write(session_factory, index, "web", "maintenance", start + timedelta(minutes=2))
+
+    # A service is in the worst state of its open incidents
+    summary = index.summary()
+    assert summary["status"] == "outage"
+    assert summary["open_incidents"] == 3
+    assert states(summary) == {"api": ("outage", 2), "web": ("maintenance", 1)}
+
+    # Resolving the outage leaves the api in the state of its other open incident
+    await write(session_factory, index, "api", "operational", start + timedelta(minutes=3), api_outage)
+    summary = index.summary()
+    assert states(summary) == {"api": ("degraded", 1), "web": ("maintenance", 1)}
+    assert summary["status"] == "degraded"
+
+    api = next(s for s in summary["services"] if s["service"] == "api")
+    assert api["last_transition_at"] == start + timedelta(minutes=3)
+    assert 56 * 60 < api["seconds_since_transition"] < 58 * 60
+
+    # A fresh load from the database agrees with the incrementally maintained index
+    reloaded = StateIndex(session_factory)
+    await reloaded.load()
+    assert states(reloaded.summary()) == states(summary)
+
+@pytest.mark.asyncio
+async def test_load_corrects_drift(session_factory):
+    index = StateIndex(session_factory)
+    start = datetime.utcnow()
+    await write(session_factory, index, "api", "outage", start)
+
+    # Simulate drift, e.g. a write made by another process
+    index.services["api"].open_states.clear()
+
+    await index.load()
+    assert states(index.summary()) == {"api": ("outage", 1)}
+    assert index.reconciled_at is not None
+
+@pytest.mark.asyncio
+async def test_record_after_load_is_not_counted_twice(session_factory):
+    index = StateIndex(session_factory)
+    await index.load()
+
+    # The reconcile loop can load between an endpoint's commit and its record
+    entry = await add_incident(session_factory, "api", "outage")
+    await index.load()
+    index.record(entry, created=True)
+
+    summary = index.summary()
+    assert summary["open_incidents"] == 1
+    assert states(summary) == {"api": ("outage", 1)}
+
+@pytest.mark.asyncio
+async def test_writes_recorded_during_load_are_kept(session_factory, monkeypatch):
+    index = StateIndex(session_factory)
+    await index.load()
+
+    execute = AsyncSession.execute
+    raced = False
+
+    async def racing_execute(session, *args, **kwargs):
+        nonlocal raced
+        result = await execute(session, *args, **kwargs)
+        if not raced:
+            # Committed after the load counted open incidents
+            raced = True
+            await write(session_factory, index, "api", "outage", datetime.utcnow())
+        return result
+
+    monkeypatch.setattr(AsyncSession, "execute", racing_execute)
+    await index.load()
+
+    assert states(index.summary()) == {"api": ("outage", 1)}
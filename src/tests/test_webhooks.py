@@ -0,0 +1,249 @@
+import asyncio
+import json
+import threading
+from datetime import datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.webhooks import WebhookDispatcher, backoff_delay, enqueue_event, outbox_metrics
+from app.models.webhook import WebhookSubscriber, WebhookOutbox
+
+class Receiver:
+    """
+    A local stand-in for a subscriber's HTTP endpoint. Responds with the
+    queued status codes in order, then 200.
+    """
+
+    def __init__(self, statuses=()):
+        self.statuses = list(statuses)
+        self.requests = []
+        receiver = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                body = self.rfile.read(int(self.headers["Content-Length"]))
+                receiver.requests.append(json.loads(body))
+                status = receiver.statuses.pop(0) if receiver.statuses else 200
+                self.send_response(status)
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}/hook"
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+    def __exit__(self, *args):
+        self.server.shutdown()
+        self.server.server_close()
+
+async def add_subscriber(session_factory, url, **kwargs):
+    async with session_factory() as session:
+        subscriber = WebhookSubscriber(url=url, **kwargs)
+        session.add(subscriber)
+        await session.commit()
+        return subscriber.id
+
+async def add_events(session_factory, event_type, count):
+    async with session_factory() as session:
+        for i in range(count):
+            await enqueue_event(session, event_type, {"n": i})
+        await session.commit()
+
+async def outbox_rows(session_factory):
+    async with session_factory() as session:
+        result = await session.execute(select(WebhookOutbox).order_by(WebhookOutbox.id))
+        return result.scalars().all()
+
+async def wait_for(condition, timeout=5.0):
+    deadline = asyncio.get_running_loop().time() + timeout
+    while not await condition():
+        assert asyncio.get_running_loop().time() < deadline, "condition not met in time"
+        await asyncio.sleep(0.02)
+
+async def all_settled(session_factory):
+    rows = await outbox_rows(session_factory)
+    # Delivered rows are deleted, so only failed ones remain
+    return all(row.status == "failed" for row in rows)
+
+def test_backoff_delay_is_exponential_and_capped():
+    assert [backoff_delay(n, base=1.0, maximum=10.0) for n in range(1, 6)] == [1.0, 2.0, 4.0, 8.0, 10.0]
+
+@pytest.mark.asyncio
+async def test_enqueue_event_filters_subscribers(session_factory):
+    await add_subscriber(session_factory, "https://hooks.test/all", events=[])
+    await add_subscriber(session_factory, "https://hooks.test/resolved", events=["incident.resolved"])
+
+    await add_events(session_factory, "incident.created", 1)
+    await add_events(session_factory, "incident.resolved", 1)
+
+    rows = await outbox_rows(session_factory)
+    assert [(row.subscriber_id, row.event_type) for row in rows] == [
+        (1, "incident.created"),
+        (1, "incident.resolved"),
+        (2, "incident.resolved")
+    ]
+    assert all(row.status == "pending" for row in rows)
+
+@pytest.mark.asyncio
+async def test_dispatcher_delivers_batches(session_factory):
+    with Receiver() as receiver:
+        await add_subscriber(session_factory, receiver.url, max_concurrency=1)
+        await add_events(session_factory, "incident.created", 25)
+
+        dispatcher = WebhookDispatcher(session_factory, workers=2, batch_size=10, poll_interval=0.05)
+        await dispatcher.start()
+        try:
+            await wait_for(lambda: all_settled(session_factory))
+        finally:
+            await dispatcher.close()
+
+    assert [len(request["events"]) for request in receiver.requests] == [10, 10, 5]
+    delivered = [event["data"]["n"] for request in receiver.requests for event in request["events"]]
+    assert delivered == list(range(25))
+    assert dispatcher.batches_sent == 3
+    assert dispatcher.events_delivered == 25
+
+    assert await outbox_rows(session_factory) == []
+
+@pytest.mark.asyncio
+async def test_dispatcher_retries_with_backoff(session_factory):
+    with Receiver(statuses=[500, 503]) as receiver:
+        await add_subscriber(session_factory, receiver.url)
+        await add_events(session_factory, "incident.created", 1)
+
+        dispatcher = WebhookDispatcher(
+            session_factory, workers=1, poll_interval=0.02, backoff_base=0.05, backoff_max=1.0
+        )
+        await dispatcher.start()
+        try:
+            await wait_for(lambda: all_settled(session_factory))
+        finally:
+            await dispatcher.close()
+
+    assert len(receiver.requests) == 3
+    assert dispatcher.events_retried == 2
+    assert dispatcher.events_delivered == 1
+    assert await outbox_rows(session_factory) == []
+
+@pytest.mark.asyncio
+async def test_dispatcher_gives_up_after_max_attempts(session_factory):
+    with Receiver(statuses=[500, 500, 500]) as receiver:
+        await add_subscriber(session_factory, receiver.url)
+        await add_events(session_factory, "incident.created", 1)
+
+        dispatcher = WebhookDispatcher(
+            session_factory, workers=1, poll_interval=0.02, max_attempts=2, backoff_base=0.01
+        )
+        await dispatcher.start()
+        try:
+            await wait_for(lambda: all_settled(session_factory))
+        finally:
+            await dispatcher.close()
+
+    assert len(receiver.requests) == 2
+    row = (await outbox_rows(session_factory))[0]
+    assert row.status == "failed"
+    assert "500" in row.last_error
+
+@pytest.mark.asyncio
+async def test_backlogged_subscriber_does_not_block_others(session_factory):
+    busy = await add_subscriber(session_factory, "https://hooks.test/busy", max_concurrency=1)
+    await add_events(session_factory, "incident.created", 200)
+    quiet = await add_subscriber(session_factory, "https://hooks.test/quiet")
+    await add_events(session_factory, "incident.created", 1)
+
+    dispatcher = WebhookDispatcher(session_factory, workers=4, batch_size=10)
+    assert await dispatcher.poll() == 2
+
+    batches = [dispatcher._queue.get_nowait() for _ in range(dispatcher._queue.qsize())]
+    assert [(batch.subscriber_id, len(batch.ids)) for batch in batches] == [(busy, 10), (quiet, 1)]
+
+@pytest.mark.asyncio
+async def test_expired_claims_are_delivered_again(session_factory, monkeypatch):
+    with Receiver() as receiver:
+        await add_subscriber(session_factory, receiver.url)
+        await add_events(session_factory, "incident.created", 2)
+
+        dispatcher = WebhookDispatcher(session_factory, workers=1, poll_interval=0.02, claim_lease=0.2)
+        deliver = dispatcher.deliver
+        failures = 0
+
+        async def failing_deliver(batch):
+            # The POST succeeds but recording the outcome fails, e.g. SQLite busy
+            nonlocal failures
+            if failures == 0:
+                failures += 1
+                await dispatcher.client.post(batch.url, json=batch.body)
+                raise RuntimeError("database is locked")
+            return await deliver(batch)
+
+        monkeypatch.setattr(dispatcher, "deliver", failing_deliver)
+        await dispatcher.start()
+        try:
+            # The rows stay claimed until the lease runs out, then are retried
+            await asyncio.sleep(0.1)
+            assert [row.status for row in await outbox_rows(session_factory)] == ["in_flight", "in_flight"]
+            await wait_for(lambda: all_settled(session_factory))
+        finally:
+            await dispatcher.close()
+
+    # Delivery is at least once: the first batch is sent again
+    assert [len(request["events"]) for request in receiver.requests] == [2, 2]
+    assert dispatcher.events_delivered == 2
+
+@pytest.mark.asyncio
+async def test_rows_are_claimed_by_one_dispatcher(session_factory, monkeypatch):
+    await add_subscriber(session_factory, "https://hooks.test/all")
+    await add_events(session_factory, "incident.created", 3)
+
+    first = WebhookDispatcher(session_factory, workers=1)
+    second = WebhookDispatcher(session_factory, workers=1)
+
+    execute = AsyncSession.execute
+    calls = 0
+
+    async def racing_execute(session, *args, **kwargs):
+        nonlocal calls
+        calls += 1
+        result = await execute(session, *args, **kwargs)
+        if calls == 2:
+            # The first dispatcher claims the rows the second one just read
+            assert await first.poll() == 1
+        return result
+
+    monkeypatch.setattr(AsyncSession, "execute", racing_execute)
+    assert await second.poll() == 0
+    monkeypatch.undo()
+
+    # A dispatcher starting up leaves rows claimed by a live one alone
+    await second.start()
+    await second.close()
+    assert [row.status for row in await outbox_rows(session_factory)] == ["in_flight"] * 3
+    assert await second.poll() == 0
+
+@pytest.mark.asyncio
+async def test_outbox_metrics_reports_queue_lag(session_factory):
+    await add_subscriber(session_factory, "https://hooks.test/all")
+    await add_events(session_factory, "incident.created", 3)
+
+    async with session_factory() as session:
+        rows = (await session.execute(select(WebhookOutbox))).scalars().all()
+        rows[0].created_at = datetime.utcnow() - timedelta(minutes=5)
+        await session.commit()
+
+        metrics = await outbox_metrics(session)
+
+    assert metrics["pending"] == 3
+    assert metrics["in_flight"] == 0
+    assert metrics["queue_lag_seconds"] >= 300
+    assert metrics["events_delivered"] == 0